@@ -1,12 +1,75 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+import os
+import sys
 import json
+import time
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 from query_processor import QueryProcessor
 import traceback   # ✅ Added for debugging
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to Flask's stdlib json provider
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # Flask-Compress is optional; responses are then sent uncompressed
+    Compress = None
+
+try:
+    import redis
+except ImportError:  # redis is optional; history then stays in process memory
+    redis = None
+
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson for faster request/response encoding"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+if orjson is not None:
+    app.json = ORJSONProvider(app)  # jsonify() and request.get_json() route through this
+else:
+    # No indentation or key sorting, even in debug mode
+    app.json.compact = True
+    app.json.sort_keys = False
+
+# Gzip JSON responses; /api/history repeats the same Markdown labels and compresses well
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_LEVEL"] = 6
+app.config["COMPRESS_MIN_SIZE"] = 500
+if Compress is not None:
+    Compress(app)
+
+# Enable CORS for all routes with fixed headers (public API, no per-origin logic)
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type",
+    "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
+}
+
+
+@app.before_request
+def _cors_preflight():
+    """Answer CORS preflight requests for existing routes directly (unknown paths still 404)"""
+    if request.method == 'OPTIONS' and request.url_rule is not None:
+        return '', 204
+
+
+@app.after_request
+def _cors(response):
+    response.headers.update(CORS_HEADERS)
+    return response
 
 # Initialize the query processor
 query_processor = QueryProcessor()
@@ -14,13 +77,112 @@ query_processor = QueryProcessor()
 # Store chat history (in production, use a proper database)
 chat_history = []
 
+# Shared history store so multiple workers see the same chat log
+HISTORY_KEY = "ingres:hist"
+HISTORY_LIMIT = 50
+
+
+def _connect_redis():
+    """Return a Redis client, or None to fall back to the in-memory history"""
+    if redis is None:
+        return None
+    try:
+        client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                                      decode_responses=True,
+                                      # Fail fast so an unreachable Redis can't stall startup or requests
+                                      socket_connect_timeout=1, socket_timeout=1)
+        client.ping()
+        return client
+    except redis.RedisError as e:
+        print(f"[REDIS] Unavailable, using in-memory chat history: {e}")
+        return None
+
+
+redis_client = _connect_redis()
+
+
+def append_history(chat_entry):
+    """Add an entry to the chat history, keeping only the most recent ones"""
+    if redis_client is not None:
+        try:
+            pipe = redis_client.pipeline()
+            pipe.lpush(HISTORY_KEY, app.json.dumps(chat_entry))
+            pipe.ltrim(HISTORY_KEY, 0, HISTORY_LIMIT - 1)
+            pipe.execute()
+            return
+        except redis.RedisError as e:
+            # The entry falls back to the local list, but reads still go to Redis while it
+            # answers, so it only shows up in /api/history if Redis stays down
+            print(f"[REDIS ERROR] Could not store chat entry: {e}")
+    chat_history.append(chat_entry)
+    del chat_history[:-HISTORY_LIMIT]
+
+
+def recent_history():
+    """Return the most recent chat entries, oldest first"""
+    if redis_client is not None:
+        try:
+            entries = redis_client.lrange(HISTORY_KEY, 0, HISTORY_LIMIT - 1)
+            return [app.json.loads(entry) for entry in reversed(entries)]
+        except redis.RedisError as e:
+            print(f"[REDIS ERROR] Could not read chat history: {e}")
+    return chat_history[-HISTORY_LIMIT:]
+
+
+def clear_history_store():
+    """Remove all stored chat history"""
+    if redis_client is not None:
+        try:
+            redis_client.delete(HISTORY_KEY)
+        except redis.RedisError as e:
+            print(f"[REDIS ERROR] Could not clear chat history: {e}")
+    chat_history.clear()   # ✅ instead of reassigning list
+
+
+# Status emoji per assessment category (anything unknown is shown as red)
+STATUS_EMOJI = MappingProxyType({
+    sys.intern('Safe'): "🟢",
+    sys.intern('Semi-Critical'): "🟡",
+    sys.intern('Critical'): "🔴",
+    sys.intern('Over-Exploited'): "🔴",
+})
+# The overview distinguishes Critical from Over-Exploited
+STATS_EMOJI = MappingProxyType({**STATUS_EMOJI, 'Critical': "🟠"})
+
+# Per-row templates, built once and filled with format_map() from each result row
+BLOCK_TMPL = ("{emoji} **{block_name}**\n"
+              "   • Category: {category}\n"
+              "   • Extraction: {stage_of_extraction}%\n"
+              "   • Water Level: {water_level}m below ground\n"
+              "   • Annual Recharge: {annual_recharge} MCM\n\n")
+CRITICAL_TMPL = ("🔴 **{block}**, {district}, {state}\n"
+                 "   • Status: {category}\n"
+                 "   • Extraction: {extraction_percentage}%\n\n")
+SAFE_TMPL = ("🟢 **{block}**, {district}, {state}\n"
+             "   • Extraction: {extraction_percentage}%\n"
+             "   • Annual Recharge: {annual_recharge} MCM\n\n")
+WATER_LVL_TMPL = ("📍 **{block}**\n"
+                  "   • Pre-monsoon: {pre_monsoon}m\n"
+                  "   • Post-monsoon: {post_monsoon}m\n\n")
+TREND_TMPL = ("**Year {year}**\n"
+              "   • Avg Extraction: {avg_extraction}%\n"
+              "   • Avg Water Level: {avg_water_level}m\n"
+              "   • Blocks Assessed: {blocks_assessed}\n\n")
+RECHARGE_TMPL = ("📍 **{block}**\n"
+                 "   • Annual Recharge: {annual_recharge} MCM\n"
+                 "   • Extractable: {extractable_resources} MCM\n\n")
+EXTRACTION_TMPL = ("{emoji} **{block}**\n"
+                   "   • Total Extraction: {total_extraction} MCM\n"
+                   "   • Stage: {extraction_stage}%\n"
+                   "   • Category: {category}\n\n")
+
 
 def format_response(query_result):
     """Format the query result into a human-readable response"""
     intent = query_result['intent']
     data = query_result['data']
 
-    response = ""
+    parts = []
 
     if intent == 'groundwater_status':
         location = data.get('location', 'Unknown')
@@ -28,168 +190,179 @@ def format_response(query_result):
         blocks = data.get('blocks', [])
 
         if blocks:
-            response = f"📍 **Groundwater Status for {location} ({year})**\n\n"
-            for block in blocks[:5]:  # Show top 5 blocks
-                status_emoji = "🟢" if block['category'] == 'Safe' else "🟡" if block['category'] == 'Semi-Critical' else "🔴"
-                response += f"{status_emoji} **{block['block_name']}**\n"
-                response += f"   • Category: {block['category']}\n"
-                response += f"   • Extraction: {block['stage_of_extraction']}%\n"
-                response += f"   • Water Level: {block['water_level']}m below ground\n"
-                response += f"   • Annual Recharge: {block['annual_recharge']} MCM\n\n"
+            parts.append(f"📍 **Groundwater Status for {location} ({year})**\n\n")
+            parts.extend(  # Show top 5 blocks
+                BLOCK_TMPL.format_map(block | {'emoji': STATUS_EMOJI.get(block['category'], "🔴")})
+                for block in blocks[:5]
+            )
         else:
-            response = f"No data found for {location}. Please try another location."
+            parts.append(f"No data found for {location}. Please try another location.")
 
     elif intent == 'critical_areas':
         areas = data.get('critical_areas', [])
         if areas:
-            response = "🚨 **Critical and Over-Exploited Areas**\n\n"
-            for area in areas[:10]:
-                response += f"🔴 **{area['block']}**, {area['district']}, {area['state']}\n"
-                response += f"   • Status: {area['category']}\n"
-                response += f"   • Extraction: {area['extraction_percentage']}%\n\n"
+            parts.append("🚨 **Critical and Over-Exploited Areas**\n\n")
+            parts.extend(map(CRITICAL_TMPL.format_map, areas[:10]))
         else:
-            response = "No critical areas found in the current assessment."
+            parts.append("No critical areas found in the current assessment.")
 
     elif intent == 'safe_areas':
         areas = data.get('safe_areas', [])
         if areas:
-            response = "✅ **Safe Groundwater Areas**\n\n"
-            for area in areas[:10]:
-                response += f"🟢 **{area['block']}**, {area['district']}, {area['state']}\n"
-                response += f"   • Extraction: {area['extraction_percentage']}%\n"
-                response += f"   • Annual Recharge: {area['annual_recharge']} MCM\n\n"
+            parts.append("✅ **Safe Groundwater Areas**\n\n")
+            parts.extend(map(SAFE_TMPL.format_map, areas[:10]))
         else:
-            response = "No safe areas data available."
+            parts.append("No safe areas data available.")
 
     elif intent == 'water_level':
         if 'location' in data:
             location = data['location']
             levels = data.get('water_levels', [])
             if levels:
-                response = f"💧 **Water Levels in {location}**\n\n"
-                for level in levels[:5]:
-                    response += f"📍 **{level['block']}**\n"
-                    response += f"   • Pre-monsoon: {level['pre_monsoon']}m\n"
-                    response += f"   • Post-monsoon: {level['post_monsoon']}m\n\n"
+                parts.append(f"💧 **Water Levels in {location}**\n\n")
+                parts.extend(map(WATER_LVL_TMPL.format_map, levels[:5]))
             else:
-                response = f"No water level data found for {location}."
+                parts.append(f"No water level data found for {location}.")
         else:
             avg_levels = data.get('average_water_levels', {})
-            response = "💧 **National Average Water Levels (2024)**\n\n"
-            response += f"• Pre-monsoon: {avg_levels.get('pre_monsoon', 'N/A')}m\n"
-            response += f"• Post-monsoon: {avg_levels.get('post_monsoon', 'N/A')}m\n"
+            parts.append("💧 **National Average Water Levels (2024)**\n\n")
+            parts.append(f"• Pre-monsoon: {avg_levels.get('pre_monsoon', 'N/A')}m\n")
+            parts.append(f"• Post-monsoon: {avg_levels.get('post_monsoon', 'N/A')}m\n")
 
     elif intent == 'historical':
         location = data.get('location', 'All India')
         trends = data.get('historical_trends', [])
         if trends:
-            response = f"📊 **Historical Trends for {location}**\n\n"
-            for trend in trends:
-                response += f"**Year {trend['year']}**\n"
-                response += f"   • Avg Extraction: {trend['avg_extraction']}%\n"
-                response += f"   • Avg Water Level: {trend['avg_water_level']}m\n"
-                response += f"   • Blocks Assessed: {trend['blocks_assessed']}\n\n"
+            parts.append(f"📊 **Historical Trends for {location}**\n\n")
+            parts.extend(map(TREND_TMPL.format_map, trends))
         else:
-            response = "No historical data available."
+            parts.append("No historical data available.")
 
     elif intent == 'recharge':
         if 'location' in data:
             location = data['location']
             recharge_data = data.get('recharge_data', [])
             if recharge_data:
-                response = f"♻️ **Groundwater Recharge in {location}**\n\n"
-                for item in recharge_data[:5]:
-                    response += f"📍 **{item['block']}**\n"
-                    response += f"   • Annual Recharge: {item['annual_recharge']} MCM\n"
-                    response += f"   • Extractable: {item['extractable_resources']} MCM\n\n"
+                parts.append(f"♻️ **Groundwater Recharge in {location}**\n\n")
+                parts.extend(map(RECHARGE_TMPL.format_map, recharge_data[:5]))
             else:
-                response = f"No recharge data found for {location}."
+                parts.append(f"No recharge data found for {location}.")
         else:
             national = data.get('national_recharge', {})
-            response = "♻️ **National Groundwater Recharge Statistics**\n\n"
-            response += f"• Average Annual Recharge: {national.get('average_annual_recharge', 'N/A')} MCM\n"
-            response += f"• Average Extractable: {national.get('average_extractable', 'N/A')} MCM\n"
-            response += f"• Total Recharge: {national.get('total_recharge', 'N/A')} MCM\n"
+            parts.append("♻️ **National Groundwater Recharge Statistics**\n\n")
+            parts.append(f"• Average Annual Recharge: {national.get('average_annual_recharge', 'N/A')} MCM\n")
+            parts.append(f"• Average Extractable: {national.get('average_extractable', 'N/A')} MCM\n")
+            parts.append(f"• Total Recharge: {national.get('total_recharge', 'N/A')} MCM\n")
 
     elif intent == 'extraction':
         if 'location' in data:
             location = data['location']
             extraction_data = data.get('extraction_data', [])
             if extraction_data:
-                response = f"⛏️ **Groundwater Extraction in {location}**\n\n"
-                for item in extraction_data[:5]:
-                    status_emoji = "🟢" if item['category'] == 'Safe' else "🟡" if item['category'] == 'Semi-Critical' else "🔴"
-                    response += f"{status_emoji} **{item['block']}**\n"
-                    response += f"   • Total Extraction: {item['total_extraction']} MCM\n"
-                    response += f"   • Stage: {item['extraction_stage']}%\n"
-                    response += f"   • Category: {item['category']}\n\n"
+                parts.append(f"⛏️ **Groundwater Extraction in {location}**\n\n")
+                parts.extend(
+                    EXTRACTION_TMPL.format_map(item | {'emoji': STATUS_EMOJI.get(item['category'], "🔴")})
+                    for item in extraction_data[:5]
+                )
             else:
-                response = f"No extraction data found for {location}."
+                parts.append(f"No extraction data found for {location}.")
         else:
             national = data.get('national_extraction', {})
-            response = "⛏️ **National Groundwater Extraction Statistics**\n\n"
-            response += f"• Average Extraction: {national.get('average_extraction', 'N/A')} MCM\n"
-            response += f"• Average Stage: {national.get('average_stage', 'N/A')}%\n"
-            response += f"• Total Extraction: {national.get('total_extraction', 'N/A')} MCM\n"
+            parts.append("⛏️ **National Groundwater Extraction Statistics**\n\n")
+            parts.append(f"• Average Extraction: {national.get('average_extraction', 'N/A')} MCM\n")
+            parts.append(f"• Average Stage: {national.get('average_stage', 'N/A')}%\n")
+            parts.append(f"• Total Extraction: {national.get('total_extraction', 'N/A')} MCM\n")
 
     elif intent == 'help':
         capabilities = data.get('capabilities', [])
         samples = data.get('sample_queries', [])
-        response = "🤖 **INGRES ChatBot - How Can I Help?**\n\n"
-        response += "**I can help you with:**\n"
+        parts.append("🤖 **INGRES ChatBot - How Can I Help?**\n\n")
+        parts.append("**I can help you with:**\n")
         for cap in capabilities:
-            response += f"• {cap}\n"
-        response += "\n**Try asking me:**\n"
+            parts.append(f"• {cap}\n")
+        parts.append("\n**Try asking me:**\n")
         for sample in samples[:5]:
-            response += f"• \"{sample}\"\n"
+            parts.append(f"• \"{sample}\"\n")
 
     else:  # General stats
         coverage = data.get('coverage', {})
         distribution = data.get('category_distribution', {})
-        response = "📊 **INGRES Database Overview**\n\n"
-        response += "**Coverage:**\n"
-        response += f"• States: {coverage.get('states', 0)}\n"
-        response += f"• Districts: {coverage.get('districts', 0)}\n"
-        response += f"• Blocks: {coverage.get('blocks', 0)}\n\n"
-        response += "**2024 Assessment Distribution:**\n"
+        parts.append("📊 **INGRES Database Overview**\n\n")
+        parts.append("**Coverage:**\n")
+        parts.append(f"• States: {coverage.get('states', 0)}\n")
+        parts.append(f"• Districts: {coverage.get('districts', 0)}\n")
+        parts.append(f"• Blocks: {coverage.get('blocks', 0)}\n\n")
+        parts.append("**2024 Assessment Distribution:**\n")
         for category, count in distribution.items():
-            emoji = "🟢" if category == 'Safe' else "🟡" if category == 'Semi-Critical' else "🟠" if category == 'Critical' else "🔴"
-            response += f"{emoji} {category}: {count} blocks\n"
+            emoji = STATS_EMOJI.get(category, "🔴")
+            parts.append(f"{emoji} {category}: {count} blocks\n")
 
-    return response
+    # join() measures all parts first and allocates the result exactly once
+    return "".join(parts)
+
+
+# [epoch second, ISO string] of the last formatted timestamp
+_TS_CACHE = [0, ""]
+
+
+def _now_iso():
+    """Current local time as ISO-8601, second precision, formatted once per second"""
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[:] = [t, datetime.fromtimestamp(t).isoformat()]
+    return _TS_CACHE[1]
+
+
+# Longer messages bypass the cache so clients can't pin arbitrarily large entries
+CACHE_MAX_MESSAGE_LEN = 256
+
+
+@lru_cache(maxsize=2048)
+def _cached_process(norm_msg):
+    """Process and format a normalized message (repeated questions skip NLP + formatting)"""
+    query_result = query_processor.process_query(norm_msg)
+    bot_response = format_response(query_result)
+    # Entities are stored as JSON so the cached value stays hashable/immutable
+    return bot_response, query_result['intent'], json.dumps(query_result.get('entities', {}))
 
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Handle chat messages"""
     try:
-        data = request.get_json()   # ✅ safer than request.json
+        # Bodies under 3 bytes (e.g. '' or '{}') can't carry a message; skip parsing them
+        if request.content_length is not None and request.content_length < 3:
+            return jsonify({'error': 'No message provided'}), 400
+
+        # silent=True: missing or malformed JSON gives None instead of raising
+        data = request.get_json(silent=True, cache=False) or {}
         user_message = data.get('message', '')
 
         if not user_message:
             return jsonify({'error': 'No message provided'}), 400
 
-        # Process the query
-        query_result = query_processor.process_query(user_message)
+        # Process and format the query (cached on the normalized message)
+        norm_message = " ".join(user_message.lower().split())
+        process = _cached_process if len(norm_message) <= CACHE_MAX_MESSAGE_LEN else _cached_process.__wrapped__
+        bot_response, intent, entities_json = process(norm_message)
+        entities = json.loads(entities_json)
 
-        # Format the response
-        bot_response = format_response(query_result)
+        timestamp = _now_iso()
 
         # Store in chat history
-        chat_entry = {
-            'timestamp': datetime.now().isoformat(),
+        append_history({
+            'timestamp': timestamp,
             'user_message': user_message,
             'bot_response': bot_response,
-            'intent': query_result['intent'],
-            'entities': query_result.get('entities', {})
-        }
-        chat_history.append(chat_entry)
+            'intent': intent,
+            'entities': entities
+        })
 
         return jsonify({
             'response': bot_response,
-            'intent': query_result['intent'],
-            'entities': query_result.get('entities', {}),
-            'timestamp': chat_entry['timestamp']
+            'intent': intent,
+            'entities': entities,
+            'timestamp': timestamp
         })
 
     except Exception as e:
@@ -201,29 +374,45 @@ def chat():
 @app.route('/api/history', methods=['GET'])
 def get_history():
     """Get chat history"""
-    return jsonify({'history': chat_history[-50:]})  # Return last 50 messages
+    return jsonify({'history': recent_history()})  # Return last 50 messages
 
 
 @app.route('/api/clear', methods=['POST'])
 def clear_history():
     """Clear chat history"""
-    chat_history.clear()   # ✅ instead of reassigning list
+    clear_history_store()
+    _cached_process.cache_clear()
     return jsonify({'message': 'Chat history cleared'})
 
 
+# Static payloads are serialized once instead of on every hit
+_HEALTH_BODY = app.json.dumps({'status': 'healthy', 'service': 'INGRES ChatBot API'},
+                              separators=(",", ":"))
+_HOME_BODY = app.json.dumps({"message": "INGRES Chatbot Backend is Running! Use /api/chat to talk."},
+                            separators=(",", ":"))
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'INGRES ChatBot API'})
+    return Response(_HEALTH_BODY, mimetype="application/json")
+
+
+# The mock database doesn't change while the app runs, so stats are reused for a while
+STATS_TTL = 60  # seconds
+_STATS_CACHE = {"t": 0.0, "v": None}
 
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get database statistics"""
     try:
-        # Get general stats using the query processor
-        result = query_processor.process_query("show me statistics")
-        return jsonify(result['data'])
+        now = time.monotonic()
+        if _STATS_CACHE["v"] is None or now - _STATS_CACHE["t"] > STATS_TTL:
+            # Get general stats using the query processor
+            _STATS_CACHE["v"] = query_processor.process_query("show me statistics")['data']
+            _STATS_CACHE["t"] = now
+        return jsonify(_STATS_CACHE["v"])
     except Exception as e:
         print("❌ Error in /api/stats:", e)
         traceback.print_exc()
@@ -232,10 +421,16 @@ def get_stats():
 
 @app.route("/")
 def home():
-    return {"message": "INGRES Chatbot Backend is Running! Use /api/chat to talk."}
+    return Response(_HOME_BODY, mimetype="application/json")
 
 
 if __name__ == '__main__':
+    # The Werkzeug dev server (reloader + debugger) is only for local development
+    if os.getenv("FLASK_ENV") != "dev":
+        print("⚠️  Production: run with `gunicorn -c gunicorn.conf.py app:app`")
+        print("   (set FLASK_ENV=dev to use the Flask development server)")
+        sys.exit(1)
+
     print("🚀 INGRES ChatBot Backend Starting...")
     print("📍 API running on http://localhost:5000")
     print("💡 Endpoints:")
@@ -0,0 +1,12 @@
+# Gunicorn settings for production: `gunicorn -c gunicorn.conf.py app:app`
+import multiprocessing
+
+bind = "0.0.0.0:5000"
+
+# Threaded workers (built into gunicorn). SQLite queries block and run one at a time
+# per worker, so processes carry the load; threads overlap the network I/O around them
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = "gthread"
+threads = 4
+
+# Chat history is shared between workers through Redis (see REDIS_URL in app.py)
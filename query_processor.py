@@ -1,8 +1,186 @@
 import os
 import re
 import sqlite3
+import threading
 from typing import Dict, List, Any, Tuple
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to per-name substring scans
+    ahocorasick = None
+
+# Location extraction stops after this many matches; callers only use the first
+MAX_LOCATIONS = 5
+
+# Only these intents read entities['locations'] when fetching data
+_INTENTS_NEEDING_LOCATION = frozenset({
+    'groundwater_status', 'water_level', 'historical', 'recharge', 'extraction'
+})
+
+# Help text never changes, so it is built once (a tuple, so it can't be mutated in place)
+_HELP_LINES = (
+    "You can ask about groundwater status in any state/district/block.",
+    "Examples:",
+    "- What is the groundwater status in Karnataka?",
+    "- Show critical areas in Tamil Nadu",
+    "- What is the average water level in Delhi?",
+    "- Give me historical trends for Punjab",
+    "- Compare extraction between states",
+    "- List safe areas in Maharashtra",
+    "- Show recharge and extraction rates"
+)
+
+# SQL is kept in module-level constants so identical statements hit the
+# connection's prepared-statement cache. Location filters use plain LIKE, which
+# SQLite already matches case-insensitively (ASCII), instead of LOWER(column).
+_SQL_STATE_NAMES = "SELECT state_name FROM states"
+_SQL_DISTRICT_NAMES = "SELECT district_name FROM districts"
+_SQL_BLOCK_NAMES = "SELECT block_name FROM blocks"
+
+# Connection-scoped denormalized copy of the assessments with their block/district/state
+# names, so the hot status/critical/safe lookups skip the 3-way join
+_SQL_CREATE_DENORM = """
+CREATE TEMP TABLE ga_denorm AS
+SELECT ga.*, b.block_name, d.district_name, s.state_name
+FROM groundwater_assessment ga
+JOIN blocks b ON ga.block_id = b.block_id
+JOIN districts d ON b.district_id = d.district_id
+JOIN states s ON d.state_id = s.state_id
+ORDER BY ga.assessment_id
+"""
+_SQL_CREATE_DENORM_INDEXES = (
+    "CREATE INDEX temp.ga_denorm_year ON ga_denorm(assessment_year, assessment_id)",
+    "CREATE INDEX temp.ga_denorm_cat ON ga_denorm(assessment_year, category, stage_of_extraction DESC)",
+)
+
+# Connection-scoped single-row summary of the 2024 assessment backing every
+# "no location" answer (national averages/totals and coverage counts)
+_SQL_CREATE_NATIONAL_SUMMARY = """
+CREATE TEMP TABLE national_summary_2024 AS
+SELECT n.*, c.*
+FROM (
+    SELECT AVG(water_level_pre_monsoon) AS wl_pre_avg,
+           AVG(water_level_post_monsoon) AS wl_post_avg,
+           AVG(annual_recharge_mcm) AS recharge_avg,
+           AVG(extractable_resources_mcm) AS extractable_avg,
+           SUM(annual_recharge_mcm) AS recharge_sum,
+           AVG(total_extraction_mcm) AS extraction_avg,
+           AVG(stage_of_extraction) AS stage_avg,
+           SUM(total_extraction_mcm) AS extraction_sum
+    FROM groundwater_assessment
+    WHERE assessment_year = 2024
+) n, (
+    SELECT COUNT(DISTINCT s.state_id) AS states_covered,
+           COUNT(DISTINCT d.district_id) AS districts_covered,
+           COUNT(DISTINCT b.block_id) AS blocks_covered,
+           AVG(ga.stage_of_extraction) AS covered_stage_avg
+    FROM groundwater_assessment ga
+    JOIN blocks b ON ga.block_id = b.block_id
+    JOIN districts d ON b.district_id = d.district_id
+    JOIN states s ON d.state_id = s.state_id
+    WHERE ga.assessment_year = 2024
+) c
+"""
+
+_SQL_GROUNDWATER_STATUS = """
+SELECT block_name, category, stage_of_extraction,
+       water_level_pre_monsoon, annual_recharge_mcm,
+       district_name, state_name
+FROM ga_denorm
+WHERE (state_name LIKE ? OR district_name LIKE ?)
+AND assessment_year = ?
+ORDER BY assessment_id
+LIMIT 10
+"""
+
+_SQL_CRITICAL_AREAS = """
+SELECT block_name, district_name, state_name,
+       category, stage_of_extraction
+FROM ga_denorm
+WHERE category IN ('Critical', 'Over-Exploited')
+AND assessment_year = 2024
+ORDER BY stage_of_extraction DESC
+LIMIT 15
+"""
+
+_SQL_SAFE_AREAS = """
+SELECT block_name, district_name, state_name,
+       stage_of_extraction, annual_recharge_mcm
+FROM ga_denorm
+WHERE category = 'Safe'
+AND assessment_year = 2024
+ORDER BY stage_of_extraction ASC
+LIMIT 15
+"""
+
+_SQL_WATER_LEVELS = """
+SELECT b.block_name, ga.water_level_pre_monsoon,
+       ga.water_level_post_monsoon, ga.assessment_year
+FROM groundwater_assessment ga
+JOIN blocks b ON ga.block_id = b.block_id
+JOIN districts d ON b.district_id = d.district_id
+JOIN states s ON d.state_id = s.state_id
+WHERE (s.state_name LIKE ? OR d.district_name LIKE ?)
+AND ga.assessment_year = 2024
+LIMIT 10
+"""
+
+_SQL_NATIONAL_WATER_LEVELS = "SELECT wl_pre_avg, wl_post_avg FROM national_summary_2024"
+
+_SQL_HISTORICAL = """
+SELECT ga.assessment_year, AVG(ga.stage_of_extraction) AS avg_extraction,
+       AVG(ga.water_level_pre_monsoon) AS avg_water_level,
+       COUNT(DISTINCT b.block_id) AS blocks_assessed
+FROM groundwater_assessment ga
+JOIN blocks b ON ga.block_id = b.block_id
+JOIN districts d ON b.district_id = d.district_id
+JOIN states s ON d.state_id = s.state_id
+WHERE (s.state_name LIKE ? OR d.district_name LIKE ?)
+GROUP BY ga.assessment_year
+ORDER BY ga.assessment_year
+"""
+
+_SQL_NATIONAL_HISTORICAL = """
+SELECT assessment_year, AVG(stage_of_extraction) AS avg_extraction,
+       AVG(water_level_pre_monsoon) AS avg_water_level,
+       COUNT(DISTINCT block_id) AS blocks_assessed
+FROM groundwater_assessment
+GROUP BY assessment_year
+ORDER BY assessment_year
+"""
+
+_SQL_RECHARGE = """
+SELECT b.block_name, ga.annual_recharge_mcm, ga.extractable_resources_mcm
+FROM groundwater_assessment ga
+JOIN blocks b ON ga.block_id = b.block_id
+JOIN districts d ON b.district_id = d.district_id
+JOIN states s ON d.state_id = s.state_id
+WHERE (s.state_name LIKE ? OR d.district_name LIKE ?)
+AND ga.assessment_year = 2024
+LIMIT 10
+"""
+
+_SQL_NATIONAL_RECHARGE = "SELECT recharge_avg, extractable_avg, recharge_sum FROM national_summary_2024"
+
+_SQL_EXTRACTION = """
+SELECT b.block_name, ga.total_extraction_mcm, ga.stage_of_extraction, ga.category
+FROM groundwater_assessment ga
+JOIN blocks b ON ga.block_id = b.block_id
+JOIN districts d ON b.district_id = d.district_id
+JOIN states s ON d.state_id = s.state_id
+WHERE (s.state_name LIKE ? OR d.district_name LIKE ?)
+AND ga.assessment_year = 2024
+LIMIT 10
+"""
+
+_SQL_NATIONAL_EXTRACTION = "SELECT extraction_avg, stage_avg, extraction_sum FROM national_summary_2024"
+
+_SQL_GENERAL_STATS = """
+SELECT states_covered, districts_covered, blocks_covered, covered_stage_avg
+FROM national_summary_2024
+"""
+
+
 class QueryProcessor:
     """Simple pattern-based NLP processor for groundwater queries"""
     
@@ -12,12 +190,29 @@ class QueryProcessor:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             db_path = os.path.join(base_dir, "data", "ingres_mock.db")
         self.db_path = db_path
+        # One connection (and one set of TEMP lookup tables) shared by every thread,
+        # opened on first use; self._lock serializes all use of it
+        self._conn = None
+        self._lock = threading.Lock()
         self.intent_patterns = self._initialize_patterns()
+        self._load_location_index()
+        # intent -> data fetcher, all called as handler(cursor, entities)
+        self._handlers = {
+            'groundwater_status': self._get_groundwater_status,
+            'critical_areas': lambda cursor, entities: self._get_critical_areas(cursor),
+            'safe_areas': lambda cursor, entities: self._get_safe_areas(cursor),
+            'water_level': self._get_water_levels,
+            'historical': self._get_historical_data,
+            'recharge': self._get_recharge_data,
+            'extraction': self._get_extraction_data,
+            'help': lambda cursor, entities: self._get_help_info(),
+        }
+        self._default_handler = lambda cursor, entities: self._get_general_stats(cursor)
 
     
-    def _initialize_patterns(self) -> Dict[str, List[Tuple[str, str]]]:
+    def _initialize_patterns(self) -> Dict[str, List[Tuple[re.Pattern, str]]]:
         """Initialize intent patterns for query classification"""
-        return {
+        patterns = {
             'groundwater_status': [
                 (r'(what|show|tell).*(groundwater|water).*status.*(of|in|for)\s+(\w+)', 'location_query'),
                 (r'status.*(of|in|for)\s+(\w+)', 'location_query'),
@@ -63,6 +258,11 @@ class QueryProcessor:
                 (r'how.*(to use|does.*work)', 'help_query'),
             ]
         }
+        # Compile once here instead of going through re's pattern cache on every query
+        return {
+            intent: [(re.compile(pattern), tag) for pattern, tag in intent_patterns]
+            for intent, intent_patterns in patterns.items()
+        }
     
     def classify_intent(self, query: str) -> Tuple[str, Dict[str, Any]]:
         """Classify user query intent and extract entities"""
@@ -71,7 +271,7 @@ class QueryProcessor:
         # Check each intent pattern
         for intent, patterns in self.intent_patterns.items():
             for pattern, _ in patterns:
-                match = re.search(pattern, query_lower)
+                match = pattern.search(query_lower)
                 if match:
                     entities = self._extract_entities(query_lower, intent, match)
                     return intent, entities
@@ -84,9 +284,10 @@ class QueryProcessor:
         entities = {}
         
         # Extract location names (states, districts, blocks)
-        locations = self._extract_locations(query)
-        if locations:
-            entities['locations'] = locations
+        if intent in _INTENTS_NEEDING_LOCATION:
+            locations = self._extract_locations(query)
+            if locations:
+                entities['locations'] = locations
         
         # Extract years
         years = re.findall(r'\b(20\d{2})\b', query)
@@ -109,58 +310,108 @@ class QueryProcessor:
         
         return entities
     
-    def _extract_locations(self, query: str) -> List[str]:
-        """Extract location names from query"""
-        locations = []
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return the shared database connection, opening it on first use (caller holds self._lock)"""
+        conn = self._conn
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=3, check_same_thread=False,
+                                   isolation_level=None, cached_statements=256)
+            # Read-mostly tuning: in-memory temp storage, 64 MB page cache, 256 MB mmap
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            try:
+                self._create_temp_tables(conn)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            conn.execute("PRAGMA query_only=1")  # this processor never writes
+            conn.row_factory = sqlite3.Row  # columns are read by name in the _get_* methods
+            self._conn = conn
+        return conn
+    
+    def _create_temp_tables(self, conn: sqlite3.Connection):
+        """Materialize the lookup tables once per connection (in memory, never written to the file)"""
+        conn.execute(_SQL_CREATE_DENORM)
+        for statement in _SQL_CREATE_DENORM_INDEXES:
+            conn.execute(statement)
+        conn.execute(_SQL_CREATE_NATIONAL_SUMMARY)
+        conn.execute("ANALYZE temp")
+    
+    def _load_location_index(self):
+        """Load lowercased state/district/block names once for location matching"""
+        states, districts, blocks = [], [], []
         try:
-            conn = sqlite3.connect(self.db_path, timeout=3)
-            cursor = conn.cursor()
-            
-            # Check for state names
-            cursor.execute("SELECT state_name FROM states")
-            states = [row[0].lower() for row in cursor.fetchall()]
-            
-            # Check for district names
-            cursor.execute("SELECT district_name FROM districts")
-            districts = [row[0].lower() for row in cursor.fetchall()]
-            
-            # Check for block names
-            cursor.execute("SELECT block_name FROM blocks")
-            blocks = [row[0].lower() for row in cursor.fetchall()]
-            
-            query_words = query.lower().split()
-            
-            # Check for exact matches
-            for word in query_words:
-                if word in states:
-                    locations.append(word.title())
-                elif word in [d.split()[0].lower() for d in districts]:
-                    for d in districts:
-                        if d.startswith(word):
-                            locations.append(d.title())
-                            break
-            
-            # Check for multi-word matches
-            query_lower = query.lower()
-            for state in states:
-                if state in query_lower:
-                    locations.append(state.title())
-            
-            for district in districts:
-                if district in query_lower:
-                    locations.append(district.title())
-            
-            for block in blocks:
-                if block in query_lower:
-                    locations.append(block.title())
-            
-            conn.close()
+            with self._lock:
+                cursor = self._get_connection().cursor()
+                
+                cursor.execute(_SQL_STATE_NAMES)
+                states = [row[0].lower() for row in cursor.fetchall()]
+                
+                cursor.execute(_SQL_DISTRICT_NAMES)
+                districts = [row[0].lower() for row in cursor.fetchall()]
+                
+                cursor.execute(_SQL_BLOCK_NAMES)
+                blocks = [row[0].lower() for row in cursor.fetchall()]
         except sqlite3.OperationalError as e:
             print(f"[DB ERROR] Could not fetch locations: {e}")
         except Exception as e:
-            print(f"[GENERAL ERROR] Location extraction failed: {e}")
+            print(f"[GENERAL ERROR] Location index load failed: {e}")
         
-        return list(set(locations))  # Remove duplicates
+        # Sets for exact word lookups, lists (in database order) for substring scans
+        self._states_set = frozenset(states)
+        self._states_list = states
+        self._districts_list = districts
+        self._blocks_list = blocks
+        
+        # First word of a district name -> first district (in database order) starting with it
+        self._district_by_first = {}
+        for district in districts:
+            first = district.split()[0]
+            if first not in self._district_by_first:
+                match = next(d for d in districts if d.startswith(first))
+                self._district_by_first[first] = match.title()
+        
+        # One automaton over every name finds all substring matches in a single pass
+        self._location_automaton = None
+        if ahocorasick is not None and (states or districts or blocks):
+            automaton = ahocorasick.Automaton()
+            for name in (*states, *districts, *blocks):
+                automaton.add_word(name, name.title())
+            automaton.make_automaton()
+            self._location_automaton = automaton
+    
+    def _extract_locations(self, query: str) -> List[str]:
+        """Extract location names from query"""
+        # dict as an insertion-ordered set: first match first, no duplicates
+        locations: Dict[str, None] = {}
+        query_lower = query.lower()
+        
+        # Check for exact matches
+        for word in query_lower.split():
+            if word in self._states_set:
+                locations[word.title()] = None
+            elif word in self._district_by_first:
+                locations[self._district_by_first[word]] = None
+        
+        if len(locations) >= MAX_LOCATIONS:
+            return list(locations)
+        
+        # Check for multi-word matches
+        if self._location_automaton is not None:
+            for _, name in self._location_automaton.iter(query_lower):
+                locations[name] = None
+                if len(locations) >= MAX_LOCATIONS:
+                    break
+        else:
+            for names in (self._states_list, self._districts_list, self._blocks_list):
+                for name in names:
+                    if name in query_lower:
+                        locations[name.title()] = None
+                if len(locations) >= MAX_LOCATIONS:
+                    break
+        
+        return list(locations)
     
     def process_query(self, query: str) -> Dict[str, Any]:
         """Main method to process user query"""
@@ -178,348 +429,199 @@ class QueryProcessor:
     
     def _get_response_data(self, intent: str, entities: Dict[str, Any]) -> Any:
         """Fetch relevant data based on intent and entities"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        handler = self._handlers.get(intent, self._default_handler)
         
-        try:
-            if intent == 'groundwater_status':
-                return self._get_groundwater_status(cursor, entities)
-            elif intent == 'critical_areas':
-                return self._get_critical_areas(cursor)
-            elif intent == 'safe_areas':
-                return self._get_safe_areas(cursor)
-            elif intent == 'water_level':
-                return self._get_water_levels(cursor, entities)
-            elif intent == 'historical':
-                return self._get_historical_data(cursor, entities)
-            elif intent == 'recharge':
-                return self._get_recharge_data(cursor, entities)
-            elif intent == 'extraction':
-                return self._get_extraction_data(cursor, entities)
-            elif intent == 'help':
-                return self._get_help_info()
-            else:
-                return self._get_general_stats(cursor)
-        finally:
-            conn.close()
+        with self._lock:
+            cursor = self._get_connection().cursor()
+            try:
+                return handler(cursor, entities)
+            finally:
+                cursor.close()
     
     # ---------------- DATA FETCH METHODS ---------------- #
+    def _first(self, entities, key, default):
+        """First extracted value for an entity key, or default when none was found"""
+        values = entities.get(key)
+        return values[0] if values else default
+    
     def _get_groundwater_status(self, cursor, entities):
         """Get groundwater status for specified location"""
-        location = entities.get('locations', ['Delhi'])[0] if entities.get('locations') else 'Delhi'
-        year = entities.get('years', [2024])[0] if entities.get('years') else 2024
+        location = self._first(entities, 'locations', 'Delhi')
+        year = self._first(entities, 'years', 2024)
         
-        query = """
-        SELECT b.block_name, ga.category, ga.stage_of_extraction, 
-               ga.water_level_pre_monsoon, ga.annual_recharge_mcm,
-               d.district_name, s.state_name
-        FROM groundwater_assessment ga
-        JOIN blocks b ON ga.block_id = b.block_id
-        JOIN districts d ON b.district_id = d.district_id
-        JOIN states s ON d.state_id = s.state_id
-        WHERE (LOWER(s.state_name) LIKE ? OR LOWER(d.district_name) LIKE ?)
-        AND ga.assessment_year = ?
-        LIMIT 10
-        """
-        
-        cursor.execute(query, (f'%{location.lower()}%', f'%{location.lower()}%', year))
-        results = cursor.fetchall()
+        pattern = f'%{location}%'
+        cursor.execute(_SQL_GROUNDWATER_STATUS, (pattern, pattern, year))
         
         return {
             'location': location,
             'year': year,
             'blocks': [
                 {
-                    'block_name': row[0],
-                    'category': row[1],
-                    'stage_of_extraction': round(row[2], 2),
-                    'water_level': round(row[3], 2),
-                    'annual_recharge': round(row[4], 2),
-                    'district': row[5],
-                    'state': row[6]
-                } for row in results
+                    'block_name': row['block_name'],
+                    'category': row['category'],
+                    'stage_of_extraction': round(row['stage_of_extraction'], 2),
+                    'water_level': round(row['water_level_pre_monsoon'], 2),
+                    'annual_recharge': round(row['annual_recharge_mcm'], 2),
+                    'district': row['district_name'],
+                    'state': row['state_name']
+                } for row in cursor
             ]
         }
     
     def _get_critical_areas(self, cursor):
         """Get list of critical and over-exploited areas"""
-        query = """
-        SELECT b.block_name, d.district_name, s.state_name, 
-               ga.category, ga.stage_of_extraction
-        FROM groundwater_assessment ga
-        JOIN blocks b ON ga.block_id = b.block_id
-        JOIN districts d ON b.district_id = d.district_id
-        JOIN states s ON d.state_id = s.state_id
-        WHERE ga.category IN ('Critical', 'Over-Exploited')
-        AND ga.assessment_year = 2024
-        ORDER BY ga.stage_of_extraction DESC
-        LIMIT 15
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
+        cursor.execute(_SQL_CRITICAL_AREAS)
         
         return {
             'critical_areas': [
                 {
-                    'block': row[0],
-                    'district': row[1],
-                    'state': row[2],
-                    'category': row[3],
-                    'extraction_percentage': round(row[4], 2)
-                } for row in results
+                    'block': row['block_name'],
+                    'district': row['district_name'],
+                    'state': row['state_name'],
+                    'category': row['category'],
+                    'extraction_percentage': round(row['stage_of_extraction'], 2)
+                } for row in cursor
             ]
         }
     
     def _get_safe_areas(self, cursor):
         """Get list of safe areas"""
-        query = """
-        SELECT b.block_name, d.district_name, s.state_name, 
-               ga.stage_of_extraction, ga.annual_recharge_mcm
-        FROM groundwater_assessment ga
-        JOIN blocks b ON ga.block_id = b.block_id
-        JOIN districts d ON b.district_id = d.district_id
-        JOIN states s ON d.state_id = s.state_id
-        WHERE ga.category = 'Safe'
-        AND ga.assessment_year = 2024
-        ORDER BY ga.stage_of_extraction ASC
-        LIMIT 15
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
+        cursor.execute(_SQL_SAFE_AREAS)
         
         return {
             'safe_areas': [
                 {
-                    'block': row[0],
-                    'district': row[1],
-                    'state': row[2],
-                    'extraction_percentage': round(row[3], 2),
-                    'annual_recharge': round(row[4], 2)
-                } for row in results
+                    'block': row['block_name'],
+                    'district': row['district_name'],
+                    'state': row['state_name'],
+                    'extraction_percentage': round(row['stage_of_extraction'], 2),
+                    'annual_recharge': round(row['annual_recharge_mcm'], 2)
+                } for row in cursor
             ]
         }
     
     def _get_water_levels(self, cursor, entities):
         """Get water level information"""
-        location = entities.get('locations', ['Delhi'])[0] if entities.get('locations') else None
-        
-        if location:
-            query = """
-            SELECT b.block_name, ga.water_level_pre_monsoon, 
-                   ga.water_level_post_monsoon, ga.assessment_year
-            FROM groundwater_assessment ga
-            JOIN blocks b ON ga.block_id = b.block_id
-            JOIN districts d ON b.district_id = d.district_id
-            JOIN states s ON d.state_id = s.state_id
-            WHERE (LOWER(s.state_name) LIKE ? OR LOWER(d.district_name) LIKE ?)
-            AND ga.assessment_year = 2024
-            LIMIT 10
-            """
-            cursor.execute(query, (f'%{location.lower()}%', f'%{location.lower()}%'))
-        else:
-            query = """
-            SELECT AVG(water_level_pre_monsoon), AVG(water_level_post_monsoon)
-            FROM groundwater_assessment
-            WHERE assessment_year = 2024
-            """
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
+        location = self._first(entities, 'locations', None)
         
         if location:
+            pattern = f'%{location}%'
+            cursor.execute(_SQL_WATER_LEVELS, (pattern, pattern))
             return {
                 'location': location,
                 'water_levels': [
                     {
-                        'block': row[0],
-                        'pre_monsoon': round(row[1], 2),
-                        'post_monsoon': round(row[2], 2),
-                        'year': row[3]
-                    } for row in results
+                        'block': row['block_name'],
+                        'pre_monsoon': round(row['water_level_pre_monsoon'], 2),
+                        'post_monsoon': round(row['water_level_post_monsoon'], 2),
+                        'year': row['assessment_year']
+                    } for row in cursor
                 ]
             }
         else:
+            cursor.execute(_SQL_NATIONAL_WATER_LEVELS)
+            row = cursor.fetchone()
             return {
                 'average_water_levels': {
-                    'pre_monsoon': round(results[0][0], 2),
-                    'post_monsoon': round(results[0][1], 2)
+                    'pre_monsoon': round(row['wl_pre_avg'], 2),
+                    'post_monsoon': round(row['wl_post_avg'], 2)
                 }
             }
     
     def _get_historical_data(self, cursor, entities):
         """Get historical groundwater data"""
         years = entities.get('years', [2020, 2021, 2022, 2023, 2024])
-        location = entities.get('locations', [])[0] if entities.get('locations') else None
+        location = self._first(entities, 'locations', None)
         
         if location:
-            query = """
-            SELECT ga.assessment_year, AVG(ga.stage_of_extraction), 
-                   AVG(ga.water_level_pre_monsoon), COUNT(DISTINCT b.block_id)
-            FROM groundwater_assessment ga
-            JOIN blocks b ON ga.block_id = b.block_id
-            JOIN districts d ON b.district_id = d.district_id
-            JOIN states s ON d.state_id = s.state_id
-            WHERE (LOWER(s.state_name) LIKE ? OR LOWER(d.district_name) LIKE ?)
-            GROUP BY ga.assessment_year
-            ORDER BY ga.assessment_year
-            """
-            cursor.execute(query, (f'%{location.lower()}%', f'%{location.lower()}%'))
+            pattern = f'%{location}%'
+            cursor.execute(_SQL_HISTORICAL, (pattern, pattern))
         else:
-            query = """
-            SELECT assessment_year, AVG(stage_of_extraction), 
-                   AVG(water_level_pre_monsoon), COUNT(DISTINCT block_id)
-            FROM groundwater_assessment
-            GROUP BY assessment_year
-            ORDER BY assessment_year
-            """
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
+            cursor.execute(_SQL_NATIONAL_HISTORICAL)
         
         return {
             'historical_trends': [
                 {
-                    'year': row[0],
-                    'avg_extraction': round(row[1], 2),
-                    'avg_water_level': round(row[2], 2),
-                    'blocks_assessed': row[3]
-                } for row in results
+                    'year': row['assessment_year'],
+                    'avg_extraction': round(row['avg_extraction'], 2),
+                    'avg_water_level': round(row['avg_water_level'], 2),
+                    'blocks_assessed': row['blocks_assessed']
+                } for row in cursor
             ],
             'location': location if location else 'All India'
         }
     
     def _get_recharge_data(self, cursor, entities):
         """Get groundwater recharge information"""
-        location = entities.get('locations', [])[0] if entities.get('locations') else None
-        
-        if location:
-            query = """
-            SELECT b.block_name, ga.annual_recharge_mcm, ga.extractable_resources_mcm
-            FROM groundwater_assessment ga
-            JOIN blocks b ON ga.block_id = b.block_id
-            JOIN districts d ON b.district_id = d.district_id
-            JOIN states s ON d.state_id = s.state_id
-            WHERE (LOWER(s.state_name) LIKE ? OR LOWER(d.district_name) LIKE ?)
-            AND ga.assessment_year = 2024
-            LIMIT 10
-            """
-            cursor.execute(query, (f'%{location.lower()}%', f'%{location.lower()}%'))
-        else:
-            query = """
-            SELECT AVG(annual_recharge_mcm), AVG(extractable_resources_mcm),
-                   SUM(annual_recharge_mcm)
-            FROM groundwater_assessment
-            WHERE assessment_year = 2024
-            """
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
+        location = self._first(entities, 'locations', None)
         
         if location:
+            pattern = f'%{location}%'
+            cursor.execute(_SQL_RECHARGE, (pattern, pattern))
             return {
                 'location': location,
                 'recharge_data': [
                     {
-                        'block': row[0],
-                        'annual_recharge': round(row[1], 2),
-                        'extractable_resources': round(row[2], 2)
-                    } for row in results
+                        'block': row['block_name'],
+                        'annual_recharge': round(row['annual_recharge_mcm'], 2),
+                        'extractable_resources': round(row['extractable_resources_mcm'], 2)
+                    } for row in cursor
                 ]
             }
         else:
+            cursor.execute(_SQL_NATIONAL_RECHARGE)
+            row = cursor.fetchone()
             return {
                 'national_recharge': {
-                    'average_annual_recharge': round(results[0][0], 2),
-                    'average_extractable': round(results[0][1], 2),
-                    'total_recharge': round(results[0][2], 2)
+                    'average_annual_recharge': round(row['recharge_avg'], 2),
+                    'average_extractable': round(row['extractable_avg'], 2),
+                    'total_recharge': round(row['recharge_sum'], 2)
                 }
             }
     
     def _get_extraction_data(self, cursor, entities):
         """Get groundwater extraction information"""
-        location = entities.get('locations', [])[0] if entities.get('locations') else None
-        
-        if location:
-            query = """
-            SELECT b.block_name, ga.total_extraction_mcm, ga.stage_of_extraction, ga.category
-            FROM groundwater_assessment ga
-            JOIN blocks b ON ga.block_id = b.block_id
-            JOIN districts d ON b.district_id = d.district_id
-            JOIN states s ON d.state_id = s.state_id
-            WHERE (LOWER(s.state_name) LIKE ? OR LOWER(d.district_name) LIKE ?)
-            AND ga.assessment_year = 2024
-            LIMIT 10
-            """
-            cursor.execute(query, (f'%{location.lower()}%', f'%{location.lower()}%'))
-        else:
-            query = """
-            SELECT AVG(total_extraction_mcm), AVG(stage_of_extraction),
-                   SUM(total_extraction_mcm)
-            FROM groundwater_assessment
-            WHERE assessment_year = 2024
-            """
-            cursor.execute(query)
-        
-        results = cursor.fetchall()
+        location = self._first(entities, 'locations', None)
         
         if location:
+            pattern = f'%{location}%'
+            cursor.execute(_SQL_EXTRACTION, (pattern, pattern))
             return {
                 'location': location,
                 'extraction_data': [
                     {
-                        'block': row[0],
-                        'total_extraction': round(row[1], 2),
-                        'extraction_stage': round(row[2], 2),
-                        'category': row[3]
-                    } for row in results
+                        'block': row['block_name'],
+                        'total_extraction': round(row['total_extraction_mcm'], 2),
+                        'extraction_stage': round(row['stage_of_extraction'], 2),
+                        'category': row['category']
+                    } for row in cursor
                 ]
             }
         else:
+            cursor.execute(_SQL_NATIONAL_EXTRACTION)
+            row = cursor.fetchone()
             return {
                 'national_extraction': {
-                    'average_extraction': round(results[0][0], 2),
-                    'average_stage': round(results[0][1], 2),
-                    'total_extraction': round(results[0][2], 2)
+                    'average_extraction': round(row['extraction_avg'], 2),
+                    'average_stage': round(row['stage_avg'], 2),
+                    'total_extraction': round(row['extraction_sum'], 2)
                 }
             }
     
     def _get_general_stats(self, cursor):
         """Get general statistics about groundwater"""
-        query = """
-        SELECT COUNT(DISTINCT s.state_id), COUNT(DISTINCT d.district_id), 
-               COUNT(DISTINCT b.block_id), AVG(ga.stage_of_extraction)
-        FROM groundwater_assessment ga
-        JOIN blocks b ON ga.block_id = b.block_id
-        JOIN districts d ON b.district_id = d.district_id
-        JOIN states s ON d.state_id = s.state_id
-        WHERE ga.assessment_year = 2024
-        """
-        cursor.execute(query)
-        result = cursor.fetchone()
+        cursor.execute(_SQL_GENERAL_STATS)
+        row = cursor.fetchone()
         
         return {
             'general_stats': {
-                'states_covered': result[0],
-                'districts_covered': result[1],
-                'blocks_covered': result[2],
-                'average_extraction_stage': round(result[3], 2)
+                'states_covered': row['states_covered'],
+                'districts_covered': row['districts_covered'],
+                'blocks_covered': row['blocks_covered'],
+                'average_extraction_stage': round(row['covered_stage_avg'], 2)
             }
         }
     
     def _get_help_info(self):
         """Provide help information about chatbot capabilities"""
-        return {
-            'help': [
-                "You can ask about groundwater status in any state/district/block.",
-                "Examples:",
-                "- What is the groundwater status in Karnataka?",
-                "- Show critical areas in Tamil Nadu",
-                "- What is the average water level in Delhi?",
-                "- Give me historical trends for Punjab",
-                "- Compare extraction between states",
-                "- List safe areas in Maharashtra",
-                "- Show recharge and extraction rates"
-            ]
-        }
+        return {'help': _HELP_LINES}